@@ -0,0 +1,13 @@
+"""
+CORS settings shared by the full and minimal Aura AI apps
+Standard library only, so the minimal apps can use it without config's dependencies
+"""
+import os
+from typing import List
+
+def cors_origins() -> List[str]:
+    """Allowed browser origins from the comma-separated CORS_ORIGINS env var (default "*")
+
+    "*" is answered with a literal wildcard, so apps must not allow credentials with it.
+    """
+    return [origin.strip() for origin in (os.getenv("CORS_ORIGINS") or "*").split(",") if origin.strip()]
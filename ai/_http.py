@@ -0,0 +1,31 @@
+"""
+Shared HTTP client session for Aura AI Backend
+One connection-pooled aiohttp session per event loop, so repeated API calls reuse
+TCP/TLS connections and cached DNS lookups instead of handshaking on every request
+"""
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared session, creating it on first use or when called from a new event loop"""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+        _session_loop = loop
+    return _session
+
+async def close_session():
+    """Close the shared session; call before the owning event loop shuts down"""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
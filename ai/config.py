@@ -4,6 +4,8 @@ Configuration module for Aura AI Backend
 import os
 from dotenv import load_dotenv
 
+from _cors import cors_origins
+
 # Load environment variables
 load_dotenv()
 
@@ -19,6 +21,7 @@ class Config:
     # API Configuration
     API_HOST = os.getenv("API_HOST", "0.0.0.0")
     API_PORT = int(os.getenv("API_PORT", "8000"))
+    CORS_ORIGINS = cors_origins()
     DEBUG = os.getenv("DEBUG", "True").lower() == "true"
     
     # Model Configuration
@@ -47,8 +47,10 @@ class ContractAnalysis:
 class LaunchpadScanner:
     """Main class for scanning and analyzing launchpad contracts"""
     
-    def __init__(self):
-        self.session = None
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        # A caller-provided session is shared across scanners and left open on exit
+        self.session = session
+        self._owns_session = session is None
         
         # Risk patterns for static analysis
         self.risk_patterns = {
@@ -97,11 +99,12 @@ class LaunchpadScanner:
         }
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self._owns_session:
+            self.session = aiohttp.ClientSession()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
     
     async def fetch_contract_source(self, address: str) -> Optional[Dict]:
@@ -486,9 +489,9 @@ class LaunchpadScanner:
         return economics
 
 # Utility functions
-async def scan_contract_address(address: str) -> Dict:
-    """Scan a contract address and return analysis"""
-    async with LaunchpadScanner() as scanner:
+async def scan_contract_address(address: str, session: Optional[aiohttp.ClientSession] = None) -> Dict:
+    """Scan a contract address and return analysis (optionally over a shared aiohttp session)"""
+    async with LaunchpadScanner(session) as scanner:
         analysis = await scanner.scan_contract(address)
         
         return {
@@ -512,7 +515,7 @@ async def scan_contract_address(address: str) -> Dict:
             "timestamp": analysis.timestamp
         }
 
-async def quick_risk_assessment(address: str) -> Dict:
+async def quick_risk_assessment(address: str, session: Optional[aiohttp.ClientSession] = None) -> Dict:
     """Quick risk assessment for immediate feedback"""
     try:
         # Basic validation
@@ -525,7 +528,7 @@ async def quick_risk_assessment(address: str) -> Dict:
             }
         
         # Perform quick scan
-        result = await scan_contract_address(address)
+        result = await scan_contract_address(address, session)
         
         return {
             "risk_score": result["risk_score"],
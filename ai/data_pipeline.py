@@ -40,15 +40,23 @@ cache = DataCache()
 class OracleDataPipeline:
     """Main class for fetching real-time market data"""
     
-    def __init__(self):
-        self.session = None
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        # A caller-provided session is shared across pipelines and left open on exit
+        self.session = session
+        self._owns_session = session is None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self._owns_session:
+            # Pooled keep-alive connections with cached DNS, so the pipeline's fetches to the same
+            # host reuse sockets instead of paying TCP+TLS setup each time
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10, connect=2)
+            )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
     
     async def fetch_coingecko_data(self, coin_id: str = "avalanche-2") -> Optional[Dict]:
@@ -967,54 +975,54 @@ class OracleDataPipeline:
         
         return base_fee
 
-# Utility functions for external use
-async def get_live_market_data() -> Dict:
+# Utility functions for external use; each accepts an optional shared aiohttp session
+async def get_live_market_data(session: Optional[aiohttp.ClientSession] = None) -> Dict:
     """Get live market data - main entry point"""
-    async with OracleDataPipeline() as pipeline:
+    async with OracleDataPipeline(session) as pipeline:
         return await pipeline.get_comprehensive_market_data()
 
-async def get_enhanced_coingecko_data(coin_id: str = "avalanche-2") -> Optional[Dict]:
+async def get_enhanced_coingecko_data(coin_id: str = "avalanche-2", session: Optional[aiohttp.ClientSession] = None) -> Optional[Dict]:
     """Get enhanced CoinGecko data for a specific coin"""
-    async with OracleDataPipeline() as pipeline:
+    async with OracleDataPipeline(session) as pipeline:
         return await pipeline.fetch_coingecko_data(coin_id)
 
-async def get_multi_coin_data(coin_ids: List[str] = None) -> Dict:
+async def get_multi_coin_data(coin_ids: List[str] = None, session: Optional[aiohttp.ClientSession] = None) -> Dict:
     """Get data for multiple coins"""
-    async with OracleDataPipeline() as pipeline:
+    async with OracleDataPipeline(session) as pipeline:
         return await pipeline.fetch_coingecko_multi_coins(coin_ids)
 
-async def get_global_market_data() -> Optional[Dict]:
+async def get_global_market_data(session: Optional[aiohttp.ClientSession] = None) -> Optional[Dict]:
     """Get global cryptocurrency market data"""
-    async with OracleDataPipeline() as pipeline:
+    async with OracleDataPipeline(session) as pipeline:
         return await pipeline.fetch_coingecko_global_data()
 
-async def get_avax_price() -> Optional[float]:
+async def get_avax_price(session: Optional[aiohttp.ClientSession] = None) -> Optional[float]:
     """Get current AVAX price"""
-    async with OracleDataPipeline() as pipeline:
+    async with OracleDataPipeline(session) as pipeline:
         coingecko_data = await pipeline.fetch_coingecko_data()
         if coingecko_data:
             return coingecko_data.get("price_usd")
         return None
 
-async def get_volatility() -> Optional[float]:
+async def get_volatility(session: Optional[aiohttp.ClientSession] = None) -> Optional[float]:
     """Get current AVAX volatility"""
-    async with OracleDataPipeline() as pipeline:
+    async with OracleDataPipeline(session) as pipeline:
         coingecko_data = await pipeline.fetch_coingecko_data()
         if coingecko_data:
             return coingecko_data.get("volatility")
         return None
 
-async def get_market_sentiment() -> str:
+async def get_market_sentiment(session: Optional[aiohttp.ClientSession] = None) -> str:
     """Get overall market sentiment"""
-    async with OracleDataPipeline() as pipeline:
+    async with OracleDataPipeline(session) as pipeline:
         global_data = await pipeline.fetch_coingecko_global_data()
         if global_data:
             return global_data.get("market_sentiment", "neutral")
         return "unknown"
 
-async def get_cross_asset_analysis() -> Dict:
+async def get_cross_asset_analysis(session: Optional[aiohttp.ClientSession] = None) -> Dict:
     """Get cross-asset correlation analysis"""
-    async with OracleDataPipeline() as pipeline:
+    async with OracleDataPipeline(session) as pipeline:
         multi_coin_data = await pipeline.fetch_coingecko_multi_coins()
         if multi_coin_data:
             return pipeline._analyze_cross_asset_correlations(multi_coin_data)
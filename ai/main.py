@@ -4,20 +4,35 @@ Provides REST API endpoints for DEX fee recommendations and contract scanning
 """
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import uvicorn
 import asyncio
+import bisect
 import logging
+import multiprocessing
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Optional, Dict, List
 from pydantic import BaseModel, Field
 import json
 
+try:
+    import orjson
+
+    def _json_bytes(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_bytes(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 # Import with error handling for Railway deployment
 try:
     from config import Config
 except ImportError as e:
     print(f"Warning: Could not import config: {e}")
+    from _cors import cors_origins
     # Fallback configuration
     class Config:
         LOG_LEVEL = "INFO"
@@ -25,6 +40,7 @@ except ImportError as e:
         API_HOST = "0.0.0.0"
         API_PORT = 8000
         DEBUG = False
+        CORS_ORIGINS = cors_origins()
 
 # Import data pipeline functions with error handling
 try:
@@ -49,7 +65,10 @@ except ImportError as e:
 
 # Import production models with error handling
 try:
-    from production_models import get_production_fee_recommendation, get_model_info, train_production_models
+    from production_models import (
+        get_production_fee_recommendation, get_model_info,
+        train_production_models, reload_production_models, close_production_models
+    )
     PRODUCTION_MODELS_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: Could not import production_models: {e}")
@@ -58,6 +77,8 @@ except ImportError as e:
     async def get_production_fee_recommendation(): return {"recommended_fee": 0.3, "confidence": 0.5, "reasoning": "Fallback mode"}
     def get_model_info(): return {"status": "unavailable"}
     async def train_production_models(): return {"status": "unavailable"}
+    def reload_production_models(): return False
+    def close_production_models(): pass
 
 # Import contract scanner with error handling
 try:
@@ -70,26 +91,75 @@ except ImportError as e:
     async def scan_contract_address(address): return {"risk_score": 0.5, "risk_level": "unknown"}
     async def quick_risk_assessment(address): return {"risk_score": 0.5, "risk_level": "unknown"}
 
+from sentiment import RSI_BINS, RSI_LABELS, VOLATILITY_ADJUST_THRESHOLD
+
 # Setup logging
 logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL), format=Config.LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
+# Application lifespan: startup before the yield, shutdown after it
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize shared resources on startup and release them on shutdown"""
+    logger.info("Starting Aura AI Backend...")
+    
+    # Dedicated process for CPU-bound model retraining so it never blocks the event loop
+    # (spawned, not forked, so the child doesn't inherit the loop's threads and open sockets)
+    app.state.train_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    
+    # Market data cache; market_data_deadline_ns is the time.monotonic_ns() value after which it is stale
+    app.state.market_data_cache = {}
+    app.state.market_data_deadline_ns = 0
+    
+    # Log service availability
+    logger.info(f"Data Pipeline Available: {DATA_PIPELINE_AVAILABLE}")
+    logger.info(f"Production Models Available: {PRODUCTION_MODELS_AVAILABLE}")
+    logger.info(f"Contract Scanner Available: {CONTRACT_SCANNER_AVAILABLE}")
+    
+    # Validate configuration (non-blocking)
+    try:
+        if hasattr(Config, 'validate_config') and not Config.validate_config():
+            logger.warning("Some API keys are missing - functionality may be limited")
+    except Exception as e:
+        logger.warning(f"Configuration validation failed: {e}")
+    
+    # Warm up AI models (non-blocking)
+    if PRODUCTION_MODELS_AVAILABLE:
+        try:
+            logger.info("Warming up AI models...")
+            # Production models are ready on import
+            logger.info("AI models ready")
+        except Exception as e:
+            logger.warning(f"AI models warmup failed: {e}")
+    else:
+        logger.warning("AI models not available - running in fallback mode")
+    
+    logger.info("Aura AI Backend started successfully")
+    
+    yield
+    
+    logger.info("Shutting down Aura AI Backend...")
+    app.state.train_pool.shutdown(wait=False, cancel_futures=True)
+    close_production_models()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Aura AI Backend",
     description="AI-powered backend for Aura Protocol providing DEX fee recommendations and contract analysis",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
-# Add CORS middleware
+# Add CORS middleware: explicit origins are a set lookup; a wildcard without credentials is
+# answered with a literal "*" instead of echoing each request's Origin back
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=Config.CORS_ORIGINS,
+    allow_credentials="*" not in Config.CORS_ORIGINS,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
 # Pydantic models for request/response
@@ -180,13 +250,24 @@ async def get_global_market_stats():
         logger.error(f"Error fetching global market data: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch global market data: {str(e)}")
 
+MAX_MULTI_COIN_IDS = 50  # Keeps the batched CoinGecko /coins/markets query bounded
+
 @app.get("/market-data/multi-coin")
 async def get_multi_coin_analysis(
     coins: str = Query("avalanche-2,bitcoin,ethereum", description="Comma-separated coin IDs")
 ):
     """Get multi-coin analysis and correlations"""
     try:
-        coin_ids = [coin.strip() for coin in coins.split(",")]
+        # De-duplicate and sort so equivalent queries share one upstream batch call and cache key
+        coin_ids = sorted({coin.strip() for coin in coins.split(",") if coin.strip()})
+        if not coin_ids:
+            raise HTTPException(status_code=400, detail="At least one coin ID is required")
+        if len(coin_ids) > MAX_MULTI_COIN_IDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many coin IDs (max {MAX_MULTI_COIN_IDS})"
+            )
+        
         multi_coin_data = await get_multi_coin_data(coin_ids)
         
         if not multi_coin_data:
@@ -240,16 +321,9 @@ async def get_market_sentiment_analysis():
             rsi = enhanced_data.get("rsi_14", 50)
             volatility = enhanced_data.get("volatility", 0)
             
-            if rsi > 70:
-                sentiment_data["avax_sentiment"] = "bullish_extreme"
-            elif rsi > 60:
-                sentiment_data["avax_sentiment"] = "bullish"
-            elif rsi < 30:
-                sentiment_data["avax_sentiment"] = "bearish_extreme"
-            elif rsi < 40:
-                sentiment_data["avax_sentiment"] = "bearish"
+            sentiment_data["avax_sentiment"] = RSI_LABELS[bisect.bisect_right(RSI_BINS, rsi)]
             
-            sentiment_data["volatility_adjusted"] = volatility > 8
+            sentiment_data["volatility_adjusted"] = volatility > VOLATILITY_ADJUST_THRESHOLD
             sentiment_data["rsi"] = rsi
         
         if global_data:
@@ -277,47 +351,9 @@ async def get_specific_coin_data(coin_id: str):
         logger.error(f"Error fetching data for coin {coin_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch coin data: {str(e)}")
 
-# Global state for caching
-market_data_cache = {}
-cache_timestamp = None
+# Market data cache lifetime (cache itself lives on app.state, per worker process)
 CACHE_DURATION = 300  # 5 minutes
 
-# Startup and shutdown events
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the application"""
-    logger.info("Starting Aura AI Backend...")
-    
-    # Log service availability
-    logger.info(f"Data Pipeline Available: {DATA_PIPELINE_AVAILABLE}")
-    logger.info(f"Production Models Available: {PRODUCTION_MODELS_AVAILABLE}")
-    logger.info(f"Contract Scanner Available: {CONTRACT_SCANNER_AVAILABLE}")
-    
-    # Validate configuration (non-blocking)
-    try:
-        if hasattr(Config, 'validate_config') and not Config.validate_config():
-            logger.warning("Some API keys are missing - functionality may be limited")
-    except Exception as e:
-        logger.warning(f"Configuration validation failed: {e}")
-    
-    # Warm up AI models (non-blocking)
-    if PRODUCTION_MODELS_AVAILABLE:
-        try:
-            logger.info("Warming up AI models...")
-            # Production models are ready on import
-            logger.info("AI models ready")
-        except Exception as e:
-            logger.warning(f"AI models warmup failed: {e}")
-    else:
-        logger.warning("AI models not available - running in fallback mode")
-    
-    logger.info("Aura AI Backend started successfully")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("Shutting down Aura AI Backend...")
-
 # Simple ping endpoint for basic connectivity
 @app.get("/ping")
 async def ping():
@@ -325,39 +361,39 @@ async def ping():
     return {"status": "ok", "timestamp": datetime.now().isoformat()}
 
 # Health check endpoint
+# Service availability is fixed at import time, so the response body is prebuilt
+# and only the timestamp is substituted per request
+_SERVICES_STATIC = {
+    "ai_models": "healthy" if PRODUCTION_MODELS_AVAILABLE else "degraded",
+    "data_pipeline": "healthy" if DATA_PIPELINE_AVAILABLE else "degraded",
+    "contract_scanner": "healthy" if CONTRACT_SCANNER_AVAILABLE else "degraded"
+}
+_HEALTH_BYTES_TEMPLATE = _json_bytes({
+    "status": "healthy",
+    "timestamp": "__TS__",
+    "version": "1.0.0",
+    "services": _SERVICES_STATIC
+})
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    services = {
-        "ai_models": "healthy" if PRODUCTION_MODELS_AVAILABLE else "degraded",
-        "data_pipeline": "healthy" if DATA_PIPELINE_AVAILABLE else "degraded",
-        "contract_scanner": "healthy" if CONTRACT_SCANNER_AVAILABLE else "degraded"
-    }
-    
     # Simple health check - don't test external services during startup
     # This ensures the health check passes even if API keys are missing
-    overall_status = "healthy"
-    
-    return HealthResponse(
-        status=overall_status,
-        timestamp=datetime.now().isoformat(),
-        version="1.0.0",
-        services=services
-    )
+    body = _HEALTH_BYTES_TEMPLATE.replace(b'"__TS__"', _json_bytes(datetime.now().isoformat()))
+    return Response(content=body, media_type="application/json")
 
 # Market data endpoints
 @app.get("/market-data", response_model=MarketDataResponse)
 async def get_market_data():
     """Get current market data"""
     try:
-        global market_data_cache, cache_timestamp
+        state = app.state
         
         # Check cache
-        if (cache_timestamp and 
-            (datetime.now() - cache_timestamp).total_seconds() < CACHE_DURATION and
-            market_data_cache):
+        if time.monotonic_ns() < state.market_data_deadline_ns and state.market_data_cache:
             logger.debug("Using cached market data")
-            return MarketDataResponse(**market_data_cache)
+            return MarketDataResponse(**state.market_data_cache)
         
         # Fetch fresh data
         market_data = await get_live_market_data()
@@ -373,8 +409,8 @@ async def get_market_data():
         }
         
         # Update cache
-        market_data_cache = response_data
-        cache_timestamp = datetime.now()
+        state.market_data_cache = response_data
+        state.market_data_deadline_ns = time.monotonic_ns() + CACHE_DURATION * 1_000_000_000
         
         return MarketDataResponse(**response_data)
         
@@ -407,7 +443,7 @@ async def recommend_fee(
     try:
         # Get market data
         market_data = None
-        if force_refresh or not market_data_cache:
+        if force_refresh or not app.state.market_data_cache:
             market_data = await get_live_market_data()
         
         # Get fee recommendation using production ML models or legacy system
@@ -449,13 +485,22 @@ async def get_ai_model_info():
         logger.error(f"Error getting model info: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get model info: {str(e)}")
 
+def _sync_train_entrypoint() -> Dict:
+    """Synchronous wrapper of train_production_models for the training process pool"""
+    return asyncio.run(train_production_models())
+
 @app.post("/retrain-models")
 async def retrain_ai_models(background_tasks: BackgroundTasks):
     """Retrain production ML models (admin endpoint)"""
     async def retrain():
         try:
             logger.info("Starting model retraining...")
-            results = await train_production_models()
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(app.state.train_pool, _sync_train_entrypoint)
+            # Training ran in another process; pick up the models it saved to disk
+            # (loading TensorFlow/ONNX models blocks, so keep it off the event loop)
+            if not await loop.run_in_executor(None, reload_production_models):
+                logger.warning("Could not load retrained models; keeping the current ones")
             logger.info(f"Model retraining completed: {results}")
         except Exception as e:
             logger.error(f"Model retraining failed: {e}")
@@ -485,17 +530,16 @@ async def get_market_analysis():
         raise HTTPException(status_code=500, detail=f"Failed to generate analysis: {str(e)}")
 
 # Contract scanning endpoints
-@app.post("/scan-contract", response_model=ContractScanResponse)
-async def scan_contract(request: ContractScanRequest):
-    """Scan a contract for security risks"""
+async def _do_scan(address: str, quick: bool) -> ContractScanResponse:
+    """Run a quick or full contract scan and build the response"""
     try:
-        address = request.address.strip()
+        address = address.strip()
         
         # Validate address format
         if not address or len(address) != 42 or not address.startswith("0x"):
             raise HTTPException(status_code=400, detail="Invalid contract address format")
         
-        if request.quick:
+        if quick:
             # Quick risk assessment
             result = await quick_risk_assessment(address)
             return ContractScanResponse(
@@ -516,17 +560,21 @@ async def scan_contract(request: ContractScanRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error scanning contract {request.address}: {e}")
+        logger.error(f"Error scanning contract {address}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to scan contract: {str(e)}")
 
-@app.get("/scan-contract/{address}")
+@app.post("/scan-contract", response_model=ContractScanResponse)
+async def scan_contract(request: ContractScanRequest):
+    """Scan a contract for security risks"""
+    return await _do_scan(request.address, request.quick)
+
+@app.get("/scan-contract/{address}", response_model=ContractScanResponse)
 async def scan_contract_get(
     address: str,
     quick: bool = Query(False, description="Perform quick scan only")
 ):
     """Scan a contract via GET request"""
-    request = ContractScanRequest(address=address, quick=quick)
-    return await scan_contract(request)
+    return await _do_scan(address, quick)
 
 @app.get("/quick-risk/{address}")
 async def quick_risk(address: str):
@@ -616,16 +664,8 @@ async def get_config():
 # Background tasks
 @app.post("/retrain-model")
 async def retrain_model(background_tasks: BackgroundTasks):
-    """Trigger model retraining (admin endpoint)"""
-    def retrain():
-        try:
-            # This would trigger model retraining in a real implementation
-            logger.info("Model retraining triggered")
-        except Exception as e:
-            logger.error(f"Model retraining failed: {e}")
-    
-    background_tasks.add_task(retrain)
-    return {"message": "Model retraining initiated", "timestamp": datetime.now().isoformat()}
+    """Trigger model retraining (admin endpoint, alias of /retrain-models)"""
+    return await retrain_ai_models(background_tasks)
 
 # Error handlers
 @app.exception_handler(404)
@@ -702,7 +742,10 @@ def main():
         host=Config.API_HOST,
         port=Config.API_PORT,
         reload=Config.DEBUG,
-        log_level=Config.LOG_LEVEL.lower()
+        log_level=Config.LOG_LEVEL.lower(),
+        # Per-request access logging is costly on hot endpoints; app logging is already configured above
+        access_log=False,
+        log_config=None
     )
 
 if __name__ == "__main__":
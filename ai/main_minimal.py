@@ -4,29 +4,43 @@ This version can run even if some dependencies are missing
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from datetime import datetime
 import logging
+from _cors import cors_origins
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Application lifespan: startup before the yield, shutdown after it
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the application and clean up on shutdown"""
+    logger.info("Starting Aura AI Backend (Minimal Mode)...")
+    logger.info("Aura AI Backend started successfully")
+    yield
+    logger.info("Shutting down Aura AI Backend...")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Aura AI Backend",
     description="AI-powered backend for Aura Protocol",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+CORS_ORIGINS = cors_origins()
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_credentials="*" not in CORS_ORIGINS,
+    allow_methods=["GET"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
 # Simple ping endpoint
@@ -61,19 +75,6 @@ async def root():
         "timestamp": datetime.now().isoformat()
     }
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the application"""
-    logger.info("Starting Aura AI Backend (Minimal Mode)...")
-    logger.info("Aura AI Backend started successfully")
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("Shutting down Aura AI Backend...")
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
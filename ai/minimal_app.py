@@ -0,0 +1,34 @@
+"""
+Fallback FastAPI application for Aura AI Backend
+Served by start.py when the full application fails to start; depends only on FastAPI.
+Kept in its own module so uvicorn can import it by path ("minimal_app:app") in each worker.
+"""
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from datetime import datetime
+
+from _cors import cors_origins
+
+CORS_ORIGINS = cors_origins()
+
+app = FastAPI(title="Aura AI Backend (Minimal)", version="1.0.0")
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=CORS_ORIGINS,
+    allow_credentials="*" not in CORS_ORIGINS,
+    allow_methods=["GET"],
+    allow_headers=["Content-Type", "Authorization"],
+)
+
+@app.get("/")
+async def root():
+    return {"status": "ok", "mode": "minimal", "timestamp": datetime.now().isoformat()}
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy", "mode": "minimal", "timestamp": datetime.now().isoformat()}
+
+@app.get("/ping")
+async def ping():
+    return {"status": "ok", "timestamp": datetime.now().isoformat()}
@@ -4,35 +4,170 @@ Implements neural networks, ensemble methods, and real-time learning
 """
 import numpy as np
 import pandas as pd
-import tensorflow as tf
+
+# Optional: Intel Extension for Scikit-learn swaps in oneDAL kernels for RF/GBR fit and
+# predict. Must be patched before sklearn estimators are imported.
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn()
+except ImportError:
+    pass
+
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.model_selection import train_test_split, GridSearchCV, TimeSeriesSplit
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-import xgboost as xgb
-import lightgbm as lgb
-import pickle
 import joblib
 import json
 import os
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional: LZ4-compressed model pickles (joblib needs the lz4 package for this codec).
+# Without it, pickles are written uncompressed and memory-mapped on load instead.
+try:
+    import lz4  # noqa: F401
+    MODEL_COMPRESSION = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESSION = None
+
+# Optional: ONNX export of the tree ensembles, served through onnxruntime's native predict
+try:
+    import onnxruntime as ort
+    import onnxmltools
+    import skl2onnx
+    from onnxmltools.convert.common.data_types import FloatTensorType
+    from skl2onnx.common.data_types import FloatTensorType as SklFloatTensorType
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
 from config import Config
 from data_pipeline import get_live_market_data
 
+# TensorFlow, XGBoost and LightGBM are imported where they are used: they dominate
+# module import time and aren't needed until models are built, trained or loaded
+if TYPE_CHECKING:
+    import tensorflow as tf
+
 logger = logging.getLogger(__name__)
 
+# Per-prediction scoring helpers; compiled with Numba when available, plain Python otherwise
+_njit = numba.njit(cache=True) if NUMBA_AVAILABLE else (lambda fn: fn)
+
+MODEL_BASE_CONFIDENCE = {
+    'random_forest': 0.85,
+    'gradient_boosting': 0.80,
+    'xgboost': 0.88,
+    'lightgbm': 0.86,
+    'neural_network': 0.82
+}
+
+MARKET_CONDITIONS = (
+    "highly_volatile", "congested_volatile", "stable_liquid", "stable", "volatile", "moderate"
+)
+
+@_njit
+def _model_confidence(base_conf, volatility):
+    # High volatility reduces confidence, low volatility increases it
+    if volatility > 15:
+        adjustment = -0.1
+    elif volatility < 2:
+        adjustment = 0.05
+    else:
+        adjustment = 0.0
+    return max(0.5, min(base_conf + adjustment, 0.95))
+
+@_njit
+def _market_condition_code(volatility, volume_24h, price_change_24h, gas_price_gwei):
+    # Returns an index into MARKET_CONDITIONS
+    if volatility > 15 and abs(price_change_24h) > 10:
+        return 0
+    elif volatility > 8 and gas_price_gwei > 80:
+        return 1
+    elif volatility < 2 and volume_24h > 800_000_000:
+        return 2
+    elif volatility < 3:
+        return 3
+    elif volatility > 10:
+        return 4
+    return 5
+
+def _optimal_fee_scalar(base_fee, volatility, volume_ratio, gas_trend, hour, liquidity_score, price_momentum):
+    # Volatility impact (non-linear)
+    if volatility > 10:
+        volatility_factor = 1 + (volatility - 10) ** 1.2 * 0.05
+    elif volatility < 2:
+        volatility_factor = 0.8
+    else:
+        volatility_factor = 1 + (volatility - 5) * 0.02
+    
+    # Volume impact (inverse relationship): high volume = lower fees, low volume = higher fees
+    if volume_ratio > 1.2:
+        volume_factor = 0.9
+    elif volume_ratio < 0.8:
+        volume_factor = 1.1
+    else:
+        volume_factor = 1.0
+    
+    # Gas price impact
+    gas_factor = 1 + gas_trend * 0.3
+    
+    # Time-based adjustments: peak trading hours vs low activity hours
+    if hour == 9 or hour == 10 or hour == 16 or hour == 17:
+        time_factor = 1.1
+    elif 2 <= hour <= 5:
+        time_factor = 0.9
+    else:
+        time_factor = 1.0
+    
+    # Liquidity impact
+    if liquidity_score > 5:
+        liquidity_factor = 0.95
+    elif liquidity_score < 1:
+        liquidity_factor = 1.15
+    else:
+        liquidity_factor = 1.0
+    
+    # Price momentum impact
+    momentum_factor = 1 + abs(price_momentum) * 0.01
+    
+    return base_fee * volatility_factor * volume_factor * gas_factor * time_factor * liquidity_factor * momentum_factor
+
+# Training-label kernel as a ufunc: native with Numba, np.vectorize otherwise (training-time only)
+if NUMBA_AVAILABLE:
+    _optimal_fee_kernel = numba.vectorize(['f8(f8, f8, f8, f8, f8, f8, f8)'], cache=True)(_optimal_fee_scalar)
+else:
+    _optimal_fee_kernel = np.vectorize(_optimal_fee_scalar, otypes=[np.float64])
+
+# Compile on import so the first prediction doesn't pay for it
+_model_confidence(0.75, 5.0)
+_market_condition_code(5.0, 0.0, 0.0, 0.0)
+
+# Worker threads for per-model predicts, shared by all predictor instances, so the event
+# loop isn't blocked and the models' native (GIL-releasing) kernels overlap
+_predict_pool = ThreadPoolExecutor(max_workers=5, thread_name_prefix="fee-predict")
+
 class AdvancedFeePredictor:
     """Advanced ML model for DEX fee prediction using ensemble methods and neural networks"""
     
     def __init__(self):
         self.models = {}
-        self.scalers = {}
+        self.scaler = StandardScaler()  # Neural network only; tree models are scale-invariant
+        # Per-model scalers of legacy model sets whose tree pickles were fit on scaled features
+        self._legacy_scalers = {}
         self.feature_columns = [
             'volatility', 'volume_24h', 'price_change_1h', 'price_change_24h',
             'market_cap', 'gas_price_gwei', 'liquidity_score',
@@ -42,6 +177,23 @@ class AdvancedFeePredictor:
         self.models_dir = "models/advanced/"
         self.is_trained = False
         
+        # TFLite interpreter used for neural network inference (set after training/loading)
+        self._nn_tflite = None
+        self._nn_interpreter = None
+        
+        # Traced Keras forward pass; used when no TFLite interpreter is available
+        self._nn_fn = None
+        
+        # Serialized ONNX tree models and their onnxruntime sessions (when ONNX is available)
+        self._onnx_models = {}
+        self._ort_sessions = {}
+        
+        # Native XGBoost/LightGBM boosters used to skip the sklearn wrapper on predict
+        self._xgb_booster = None
+        self._lgb_booster = None
+        
+        self._nn_lock = threading.Lock()  # TFLite interpreters are not thread-safe
+        
         # Create models directory
         os.makedirs(self.models_dir, exist_ok=True)
         
@@ -53,6 +205,8 @@ class AdvancedFeePredictor:
     
     def _initialize_models(self):
         """Initialize all ML models"""
+        import lightgbm as lgb
+        
         # Random Forest
         self.models['random_forest'] = RandomForestRegressor(
             n_estimators=200,
@@ -71,15 +225,24 @@ class AdvancedFeePredictor:
             random_state=42
         )
         
-        # XGBoost
-        self.models['xgboost'] = xgb.XGBRegressor(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42
-        )
+        # Half the cores for boosting fits, leaving headroom for the rest of the process
+        # (boosters are switched to one thread for single-row predicts in _cache_boosters)
+        train_jobs = max(1, (os.cpu_count() or 2) // 2)
+        
+        # XGBoost: native Booster trained with xgb.train on a QuantileDMatrix in train_models
+        # (histogram split finding; up to 200 rounds with early stopping)
+        self.xgb_params = {
+            'objective': 'reg:squarederror',
+            'tree_method': 'hist',
+            'max_bin': 256,
+            'max_depth': 6,
+            'learning_rate': 0.1,
+            'subsample': 0.8,
+            'colsample_bytree': 0.8,
+            'seed': 42,
+            'nthread': train_jobs
+        }
+        self.models['xgboost'] = None
         
         # LightGBM
         self.models['lightgbm'] = lgb.LGBMRegressor(
@@ -89,18 +252,17 @@ class AdvancedFeePredictor:
             subsample=0.8,
             colsample_bytree=0.8,
             random_state=42,
+            n_jobs=train_jobs,
             verbose=-1
         )
         
         # Neural Network
         self.models['neural_network'] = None  # Will be built dynamically
-        
-        # Initialize scalers
-        for model_name in self.models.keys():
-            self.scalers[model_name] = StandardScaler()
     
-    def _build_neural_network(self, input_shape: int) -> tf.keras.Model:
+    def _build_neural_network(self, input_shape: int) -> "tf.keras.Model":
         """Build a neural network for fee prediction"""
+        import tensorflow as tf
+        
         model = tf.keras.Sequential([
             tf.keras.layers.Dense(64, activation='relu', input_shape=(input_shape,)),
             tf.keras.layers.Dropout(0.2),
@@ -121,154 +283,93 @@ class AdvancedFeePredictor:
     
     def _generate_advanced_training_data(self, n_samples: int = 5000) -> pd.DataFrame:
         """Generate sophisticated training data with more realistic patterns"""
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         
-        data = []
+        # Time-based features
+        hour_of_day = rng.integers(0, 24, n_samples)
+        day_of_week = rng.integers(0, 7, n_samples)
         
-        for i in range(n_samples):
-            # Time-based features
-            hour_of_day = np.random.randint(0, 24)
-            day_of_week = np.random.randint(0, 7)
-            
-            # Market volatility with time-based patterns
-            base_volatility = 3.0
-            if hour_of_day in [9, 10, 16, 17]:  # Market open/close times
-                volatility_multiplier = 1.5
-            else:
-                volatility_multiplier = 1.0
-            
-            volatility = np.random.exponential(base_volatility) * volatility_multiplier
-            volatility = max(0.5, min(volatility, 25))
-            
-            # Volume with volatility correlation
-            base_volume = 800_000_000
-            volume_noise = np.random.lognormal(0, 0.3)
-            volatility_impact = 1 + (volatility - 5) * 0.1
-            volume_24h = base_volume * volume_noise * volatility_impact
-            volume_24h = max(50_000_000, min(volume_24h, 5_000_000_000))
-            
-            # Price changes
-            price_change_1h = np.random.normal(0, volatility/10)
-            price_change_24h = np.random.normal(0, volatility/3)
-            
-            # Market cap
-            market_cap = np.random.lognormal(24, 0.4)  # Around 26B with variation
-            
-            # Gas price with network congestion
-            if day_of_week in [1, 2, 3]:  # Weekdays more congested
-                gas_multiplier = 1.3
-            else:
-                gas_multiplier = 0.8
-            
-            gas_price_gwei = np.random.exponential(30) * gas_multiplier
-            gas_price_gwei = max(15, min(gas_price_gwei, 300))
-            
-            # Liquidity score
-            liquidity_score = (volume_24h / market_cap) * 100
-            
-            # Moving averages (simulated)
-            volume_ma_7d = volume_24h * np.random.uniform(0.8, 1.2)
-            volatility_ma_7d = volatility * np.random.uniform(0.7, 1.3)
-            
-            # Technical indicators
-            price_momentum = price_change_24h * np.random.uniform(0.5, 1.5)
-            volume_ratio = volume_24h / volume_ma_7d
-            gas_trend = (gas_price_gwei - 25) / 275  # Normalized gas trend
-            
-            # Calculate optimal fee using sophisticated logic
-            optimal_fee = self._calculate_sophisticated_optimal_fee({
-                'volatility': volatility,
-                'volume_24h': volume_24h,
-                'price_change_1h': price_change_1h,
-                'price_change_24h': price_change_24h,
-                'market_cap': market_cap,
-                'gas_price_gwei': gas_price_gwei,
-                'liquidity_score': liquidity_score,
-                'hour_of_day': hour_of_day,
-                'day_of_week': day_of_week,
-                'volume_ma_7d': volume_ma_7d,
-                'volatility_ma_7d': volatility_ma_7d,
-                'price_momentum': price_momentum,
-                'volume_ratio': volume_ratio,
-                'gas_trend': gas_trend
-            })
-            
-            row = [
-                volatility, volume_24h, price_change_1h, price_change_24h,
-                market_cap, gas_price_gwei, liquidity_score,
-                hour_of_day, day_of_week, volume_ma_7d, volatility_ma_7d,
-                price_momentum, volume_ratio, gas_trend, optimal_fee
-            ]
-            
-            data.append(row)
-        
-        columns = self.feature_columns + ['optimal_fee']
-        df = pd.DataFrame(data, columns=columns)
-        
-        return df
-    
-    def _calculate_sophisticated_optimal_fee(self, features: Dict) -> float:
-        """Calculate optimal fee using sophisticated market logic"""
-        base_fee = Config.BASE_FEE_RATE
+        # Market volatility with time-based patterns (market open/close times)
+        base_volatility = 3.0
+        volatility_multiplier = np.where(np.isin(hour_of_day, [9, 10, 16, 17]), 1.5, 1.0)
+        volatility = rng.exponential(base_volatility, n_samples) * volatility_multiplier
+        volatility = np.clip(volatility, 0.5, 25)
         
-        # Volatility impact (non-linear)
-        volatility = features['volatility']
-        if volatility > 10:
-            volatility_factor = 1 + (volatility - 10) ** 1.2 * 0.05
-        elif volatility < 2:
-            volatility_factor = 0.8
-        else:
-            volatility_factor = 1 + (volatility - 5) * 0.02
-        
-        # Volume impact (inverse relationship)
-        volume_ratio = features['volume_ratio']
-        if volume_ratio > 1.2:
-            volume_factor = 0.9  # High volume = lower fees
-        elif volume_ratio < 0.8:
-            volume_factor = 1.1  # Low volume = higher fees
-        else:
-            volume_factor = 1.0
-        
-        # Gas price impact
-        gas_trend = features['gas_trend']
-        gas_factor = 1 + gas_trend * 0.3
-        
-        # Time-based adjustments
-        hour = features['hour_of_day']
-        if hour in [9, 10, 16, 17]:  # Peak trading hours
-            time_factor = 1.1
-        elif hour in [2, 3, 4, 5]:  # Low activity hours
-            time_factor = 0.9
-        else:
-            time_factor = 1.0
-        
-        # Liquidity impact
-        liquidity_score = features['liquidity_score']
-        if liquidity_score > 5:
-            liquidity_factor = 0.95
-        elif liquidity_score < 1:
-            liquidity_factor = 1.15
-        else:
-            liquidity_factor = 1.0
+        # Volume with volatility correlation
+        base_volume = 800_000_000
+        volume_noise = rng.lognormal(0, 0.3, n_samples)
+        volatility_impact = 1 + (volatility - 5) * 0.1
+        volume_24h = np.clip(base_volume * volume_noise * volatility_impact, 50_000_000, 5_000_000_000)
+        
+        # Price changes
+        price_change_1h = rng.normal(0, volatility / 10)
+        price_change_24h = rng.normal(0, volatility / 3)
+        
+        # Market cap
+        market_cap = rng.lognormal(24, 0.4, n_samples)  # Around 26B with variation
+        
+        # Gas price with network congestion (weekdays more congested)
+        gas_multiplier = np.where(np.isin(day_of_week, [1, 2, 3]), 1.3, 0.8)
+        gas_price_gwei = np.clip(rng.exponential(30, n_samples) * gas_multiplier, 15, 300)
         
-        # Price momentum impact
-        momentum = abs(features['price_momentum'])
-        momentum_factor = 1 + momentum * 0.01
+        # Liquidity score
+        liquidity_score = (volume_24h / market_cap) * 100
         
-        # Combine all factors
-        optimal_fee = base_fee * volatility_factor * volume_factor * gas_factor * time_factor * liquidity_factor * momentum_factor
+        # Moving averages (simulated)
+        volume_ma_7d = volume_24h * rng.uniform(0.8, 1.2, n_samples)
+        volatility_ma_7d = volatility * rng.uniform(0.7, 1.3, n_samples)
+        
+        # Technical indicators
+        price_momentum = price_change_24h * rng.uniform(0.5, 1.5, n_samples)
+        volume_ratio = volume_24h / volume_ma_7d
+        gas_trend = (gas_price_gwei - 25) / 275  # Normalized gas trend
+        
+        columns = {
+            'volatility': volatility,
+            'volume_24h': volume_24h,
+            'price_change_1h': price_change_1h,
+            'price_change_24h': price_change_24h,
+            'market_cap': market_cap,
+            'gas_price_gwei': gas_price_gwei,
+            'liquidity_score': liquidity_score,
+            'hour_of_day': hour_of_day,
+            'day_of_week': day_of_week,
+            'volume_ma_7d': volume_ma_7d,
+            'volatility_ma_7d': volatility_ma_7d,
+            'price_momentum': price_momentum,
+            'volume_ratio': volume_ratio,
+            'gas_trend': gas_trend
+        }
+        
+        # Calculate optimal fee using sophisticated logic (whole batch at once) plus realistic noise
+        noise = rng.normal(0, 0.02, n_samples)
+        columns['optimal_fee'] = self._calculate_sophisticated_optimal_fee(
+            volatility, volume_ratio, gas_trend, hour_of_day, liquidity_score, price_momentum, noise
+        )
+        
+        # Column-wise construction straight from the arrays (no row lists, no extra copy)
+        return pd.DataFrame(columns, columns=self.feature_columns + ['optimal_fee'], copy=False)
+    
+    def _calculate_sophisticated_optimal_fee(self, volatility, volume_ratio, gas_trend, hour,
+                                             liquidity_score, price_momentum,
+                                             noise: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calculate optimal fee using sophisticated market logic (element-wise over feature arrays)"""
+        optimal_fee = _optimal_fee_kernel(
+            Config.BASE_FEE_RATE, volatility, volume_ratio, gas_trend, hour, liquidity_score, price_momentum
+        )
         
         # Add some realistic noise
-        noise = np.random.normal(0, 0.02)
-        optimal_fee += noise
+        if noise is not None:
+            optimal_fee = optimal_fee + noise
         
         # Clamp to reasonable bounds
-        optimal_fee = max(0.05, min(optimal_fee, 3.0))
-        
-        return optimal_fee
+        return np.clip(optimal_fee, 0.05, 3.0)
     
     def train_models(self, df: Optional[pd.DataFrame] = None) -> Dict[str, float]:
         """Train all models on the dataset"""
+        import tensorflow as tf
+        import lightgbm as lgb
+        
         logger.info("Training advanced ML models...")
         
         # Generate training data if not provided
@@ -276,8 +377,9 @@ class AdvancedFeePredictor:
             df = self._generate_advanced_training_data(5000)
         
         # Prepare features and target
-        X = df[self.feature_columns]
-        y = df['optimal_fee']
+        # Contiguous float32 arrays (matching the inference buffer) so estimators skip pandas conversion
+        X = np.ascontiguousarray(df[self.feature_columns].to_numpy(dtype=np.float32))
+        y = df['optimal_fee'].to_numpy(dtype=np.float32)
         
         # Split data with time series considerations
         X_train, X_test, y_train, y_test = train_test_split(
@@ -286,6 +388,11 @@ class AdvancedFeePredictor:
         
         results = {}
         
+        # Boosters stop adding trees once the held-out loss stops improving
+        fit_params = {
+            'lightgbm': {'eval_set': [(X_test, y_test)], 'callbacks': [lgb.early_stopping(20, verbose=False)]}
+        }
+        
         # Train each model
         for model_name, model in self.models.items():
             if model_name == 'neural_network':
@@ -293,16 +400,17 @@ class AdvancedFeePredictor:
             
             logger.info(f"Training {model_name}...")
             
-            # Scale features
-            X_train_scaled = self.scalers[model_name].fit_transform(X_train)
-            X_test_scaled = self.scalers[model_name].transform(X_test)
-            
-            # Train model
-            model.fit(X_train_scaled, y_train)
+            # Train model (tree ensembles split on raw feature values, no scaling needed)
+            if model_name == 'xgboost':
+                model = self.models['xgboost'] = self._train_xgboost(X_train, y_train, X_test, y_test)
+                predict = model.inplace_predict
+            else:
+                model.fit(X_train, y_train, **fit_params.get(model_name, {}))
+                predict = model.predict
             
             # Evaluate
-            train_pred = model.predict(X_train_scaled)
-            test_pred = model.predict(X_test_scaled)
+            train_pred = predict(X_train)
+            test_pred = predict(X_test)
             
             train_r2 = r2_score(y_train, train_pred)
             test_r2 = r2_score(y_test, test_pred)
@@ -320,8 +428,8 @@ class AdvancedFeePredictor:
         
         # Train Neural Network
         logger.info("Training neural network...")
-        X_train_nn = self.scalers['neural_network'].fit_transform(X_train)
-        X_test_nn = self.scalers['neural_network'].transform(X_test)
+        X_train_nn = self.scaler.fit_transform(X_train)
+        X_test_nn = self.scaler.transform(X_test)
         
         self.models['neural_network'] = self._build_neural_network(X_train_nn.shape[1])
         
@@ -353,6 +461,17 @@ class AdvancedFeePredictor:
         
         logger.info(f"Neural Network - Test R²: {test_r2_nn:.4f}, MAE: {test_mae_nn:.4f}")
         
+        self._build_nn_fn(self.models['neural_network'])
+        
+        # Convert to a quantized TFLite flatbuffer for low-latency single-row inference
+        self._nn_tflite = self._convert_to_tflite(self.models['neural_network'], X_train_nn)
+        if self._nn_tflite is not None:
+            self._init_tflite_interpreter(tf.lite.Interpreter(model_content=self._nn_tflite))
+        
+        self._cache_boosters()
+        self._export_onnx()
+        self._legacy_scalers = {}  # Freshly fit trees take unscaled features
+        
         # Find best model
         best_model = max(results.keys(), key=lambda k: results[k]['test_r2'])
         logger.info(f"Best performing model: {best_model}")
@@ -370,18 +489,33 @@ class AdvancedFeePredictor:
                 if model_name == 'neural_network':
                     if model is not None:
                         model.save(os.path.join(self.models_dir, f'{model_name}.h5'))
+                    if self._nn_tflite is not None:
+                        with open(os.path.join(self.models_dir, f'{model_name}.tflite'), 'wb') as f:
+                            f.write(self._nn_tflite)
+                elif model_name == 'xgboost':
+                    if model is not None:
+                        model.save_model(os.path.join(self.models_dir, f'{model_name}.json'))
                 else:
-                    joblib.dump(model, os.path.join(self.models_dir, f'{model_name}.pkl'))
+                    self._dump_model(model, os.path.join(self.models_dir, f'{model_name}.pkl'))
+            
+            # Save ONNX exports of the tree models
+            for model_name, onnx_bytes in self._onnx_models.items():
+                with open(os.path.join(self.models_dir, f'{model_name}.onnx'), 'wb') as f:
+                    f.write(onnx_bytes)
             
-            # Save scalers
-            for scaler_name, scaler in self.scalers.items():
-                joblib.dump(scaler, os.path.join(self.models_dir, f'{scaler_name}_scaler.pkl'))
+            # Save neural network scaler as raw arrays (no pickle needed for two vectors)
+            np.savez(
+                os.path.join(self.models_dir, 'scaler.npz'),
+                mean=self.scaler.mean_.astype(np.float32),
+                scale=self.scaler.scale_.astype(np.float32)
+            )
             
             # Save metadata
             metadata = {
                 'feature_columns': self.feature_columns,
                 'is_trained': self.is_trained,
-                'training_timestamp': datetime.now().isoformat()
+                'training_timestamp': datetime.now().isoformat(),
+                'model_compression': MODEL_COMPRESSION[0] if MODEL_COMPRESSION else None
             }
             
             with open(os.path.join(self.models_dir, 'metadata.json'), 'w') as f:
@@ -392,6 +526,12 @@ class AdvancedFeePredictor:
         except Exception as e:
             logger.error(f"Error saving models: {e}")
     
+    def _dump_model(self, model, path: str):
+        """Write a model pickle via a temp file so processes memory-mapping the old one keep a valid file"""
+        tmp_path = f"{path}.tmp"
+        joblib.dump(model, tmp_path, compress=MODEL_COMPRESSION or 0)
+        os.replace(tmp_path, path)
+    
     def _load_models(self):
         """Load saved models"""
         try:
@@ -405,22 +545,65 @@ class AdvancedFeePredictor:
             
             self.feature_columns = metadata.get('feature_columns', self.feature_columns)
             
-            # Load sklearn models
-            for model_name in ['random_forest', 'gradient_boosting', 'xgboost', 'lightgbm']:
+            # Load sklearn models; uncompressed pickles are memory-mapped so tree arrays page in
+            # lazily (joblib cannot memory-map compressed files)
+            mmap_mode = None if metadata.get('model_compression') else 'r'
+            for model_name in ['random_forest', 'gradient_boosting', 'lightgbm']:
                 model_path = os.path.join(self.models_dir, f'{model_name}.pkl')
                 if os.path.exists(model_path):
-                    self.models[model_name] = joblib.load(model_path)
+                    self.models[model_name] = joblib.load(model_path, mmap_mode=mmap_mode)
+            
+            # Load native XGBoost booster (older sets pickled the sklearn XGBRegressor instead)
+            xgb_path = os.path.join(self.models_dir, 'xgboost.json')
+            legacy_xgb_path = os.path.join(self.models_dir, 'xgboost.pkl')
+            if os.path.exists(xgb_path):
+                import xgboost as xgb
+                booster = xgb.Booster()
+                booster.load_model(xgb_path)
+                self.models['xgboost'] = booster
+            elif os.path.exists(legacy_xgb_path):
+                self.models['xgboost'] = joblib.load(legacy_xgb_path).get_booster()
             
-            # Load neural network
+            self._cache_boosters()
+            
+            # Load ONNX tree models
+            if ONNX_AVAILABLE:
+                for model_name in ['random_forest', 'gradient_boosting', 'xgboost', 'lightgbm']:
+                    onnx_path = os.path.join(self.models_dir, f'{model_name}.onnx')
+                    if os.path.exists(onnx_path):
+                        self._ort_sessions[model_name] = self._create_ort_session(onnx_path)
+            
+            # Load neural network (TensorFlow is only imported when there is one to load)
             nn_path = os.path.join(self.models_dir, 'neural_network.h5')
+            tflite_path = os.path.join(self.models_dir, 'neural_network.tflite')
+            if os.path.exists(nn_path) or os.path.exists(tflite_path):
+                import tensorflow as tf
+            
             if os.path.exists(nn_path):
                 self.models['neural_network'] = tf.keras.models.load_model(nn_path)
+                self._build_nn_fn(self.models['neural_network'])
+            
+            # Load quantized TFLite version of the neural network
+            if os.path.exists(tflite_path):
+                self._init_tflite_interpreter(tf.lite.Interpreter(model_path=tflite_path))
             
-            # Load scalers
-            for scaler_name in self.scalers.keys():
-                scaler_path = os.path.join(self.models_dir, f'{scaler_name}_scaler.pkl')
-                if os.path.exists(scaler_path):
-                    self.scalers[scaler_name] = joblib.load(scaler_path)
+            # Load neural network scaler (legacy pickles if no .npz was written yet)
+            self._legacy_scalers = {}
+            scaler_path = os.path.join(self.models_dir, 'scaler.npz')
+            shared_scaler_path = os.path.join(self.models_dir, 'scaler.pkl')
+            if os.path.exists(scaler_path):
+                self.scaler = self._load_scaler(scaler_path)
+            elif os.path.exists(shared_scaler_path):
+                self.scaler = joblib.load(shared_scaler_path)
+            else:
+                # Oldest format: one <model>_scaler.pkl per model, with the tree models fit on
+                # scaled features too, so keep their scalers for predicting with those pickles
+                for model_name in ['random_forest', 'gradient_boosting', 'xgboost', 'lightgbm', 'neural_network']:
+                    legacy_scaler_path = os.path.join(self.models_dir, f'{model_name}_scaler.pkl')
+                    if os.path.exists(legacy_scaler_path):
+                        self._legacy_scalers[model_name] = joblib.load(legacy_scaler_path)
+                if 'neural_network' in self._legacy_scalers:
+                    self.scaler = self._legacy_scalers.pop('neural_network')
             
             self.is_trained = True
             logger.info("Models loaded successfully")
@@ -429,7 +612,151 @@ class AdvancedFeePredictor:
             logger.error(f"Error loading models: {e}")
             self.is_trained = False
     
-    def _extract_advanced_features(self, market_data: Dict) -> Optional[np.ndarray]:
+    def _load_scaler(self, path: str) -> StandardScaler:
+        """Rebuild a fitted StandardScaler from its saved mean/scale arrays"""
+        with np.load(path) as arrays:
+            scaler = StandardScaler()
+            scaler.mean_ = arrays['mean']
+            scaler.scale_ = arrays['scale']
+        scaler.var_ = scaler.scale_ ** 2
+        scaler.n_features_in_ = scaler.mean_.shape[0]
+        scaler.n_samples_seen_ = 0  # Not persisted; only needed for partial_fit
+        return scaler
+    
+    def _train_xgboost(self, X_train: np.ndarray, y_train: np.ndarray, X_valid: np.ndarray, y_valid: np.ndarray):
+        """Train the XGBoost booster on pre-binned QuantileDMatrix data with early stopping"""
+        import xgboost as xgb
+        
+        max_bin = self.xgb_params['max_bin']
+        dtrain = xgb.QuantileDMatrix(X_train, label=y_train, max_bin=max_bin)
+        dvalid = xgb.QuantileDMatrix(X_valid, label=y_valid, max_bin=max_bin, ref=dtrain)
+        
+        booster = xgb.train(
+            self.xgb_params,
+            dtrain,
+            num_boost_round=200,
+            evals=[(dvalid, 'valid')],
+            early_stopping_rounds=20,
+            verbose_eval=False
+        )
+        
+        # Keep only the trees up to the early-stopping optimum
+        return booster[:booster.best_iteration + 1]
+    
+    def _cache_boosters(self):
+        """Cache native boosters of the fitted XGBoost/LightGBM models for direct prediction"""
+        self._xgb_booster = self.models.get('xgboost')
+        if self._xgb_booster is not None:
+            self._xgb_booster.set_param({'nthread': 1})  # Single-row predicts are slower with more threads
+        
+        try:
+            self._lgb_booster = self.models['lightgbm'].booster_
+        except Exception:
+            self._lgb_booster = None
+    
+    def _export_onnx(self):
+        """Convert the fitted tree models to ONNX and open onnxruntime sessions for them"""
+        self._onnx_models = {}
+        self._ort_sessions = {}
+        if not ONNX_AVAILABLE:
+            return
+        
+        # skl2onnx and onnxmltools each expect their own tensor type class
+        n_features = len(self.feature_columns)
+        converters = {
+            'random_forest': (skl2onnx.convert_sklearn, SklFloatTensorType),
+            'gradient_boosting': (skl2onnx.convert_sklearn, SklFloatTensorType),
+            'xgboost': (onnxmltools.convert_xgboost, FloatTensorType),
+            'lightgbm': (onnxmltools.convert_lightgbm, FloatTensorType)
+        }
+        
+        for model_name, (convert, tensor_type) in converters.items():
+            model = self.models.get(model_name)
+            if model is None:
+                continue
+            try:
+                initial_types = [('X', tensor_type([None, n_features]))]
+                onnx_bytes = convert(model, initial_types=initial_types).SerializeToString()
+                self._onnx_models[model_name] = onnx_bytes
+                self._ort_sessions[model_name] = self._create_ort_session(onnx_bytes)
+            except Exception as e:
+                logger.warning(f"ONNX export failed for {model_name}, using native predict: {e}")
+    
+    def _create_ort_session(self, model):
+        """Create a single-threaded CPU onnxruntime session from an ONNX path or serialized bytes"""
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1  # Single-row predicts don't benefit from threading
+        return ort.InferenceSession(model, sess_options=options, providers=['CPUExecutionProvider'])
+    
+    def _build_nn_fn(self, model: "tf.keras.Model"):
+        """Trace a tf.function forward pass so single-row calls skip Keras predict() overhead"""
+        import tensorflow as tf
+        
+        self._nn_fn = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec([None, len(self.feature_columns)], tf.float32)]
+        )
+        # Trace once now rather than on the first request
+        self._nn_fn(tf.zeros((1, len(self.feature_columns)), tf.float32))
+    
+    def _convert_to_tflite(self, model: "tf.keras.Model", X_calib: np.ndarray) -> Optional[bytes]:
+        """Convert the trained neural network to an int8 TFLite model (float16 fallback)"""
+        import tensorflow as tf
+        
+        def representative_dataset():
+            for i in range(min(100, len(X_calib))):
+                yield [X_calib[i:i + 1].astype(np.float32)]
+        
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = representative_dataset
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.int8
+            return converter.convert()
+        except Exception as e:
+            logger.warning(f"int8 TFLite conversion failed, trying float16: {e}")
+        
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+            return converter.convert()
+        except Exception as e:
+            logger.warning(f"TFLite conversion failed, using Keras model for inference: {e}")
+            return None
+    
+    def _init_tflite_interpreter(self, interpreter):
+        """Allocate tensors once and cache input/output tensor details"""
+        interpreter.allocate_tensors()
+        input_details = interpreter.get_input_details()[0]
+        output_details = interpreter.get_output_details()[0]
+        
+        self._nn_interpreter = interpreter
+        self._nn_input_index = input_details['index']
+        self._nn_input_dtype = input_details['dtype']
+        self._nn_input_quant = input_details['quantization']  # (scale, zero_point)
+        self._nn_output_index = output_details['index']
+        self._nn_output_dtype = output_details['dtype']
+        self._nn_output_quant = output_details['quantization']
+    
+    def _predict_tflite(self, features_scaled: np.ndarray) -> float:
+        """Run a single-row neural network prediction through the TFLite interpreter"""
+        x = features_scaled.astype(np.float32)
+        if self._nn_input_dtype == np.int8:
+            scale, zero_point = self._nn_input_quant
+            x = np.clip(np.round(x / scale + zero_point), -128, 127).astype(np.int8)
+        
+        self._nn_interpreter.set_tensor(self._nn_input_index, x)
+        self._nn_interpreter.invoke()
+        output = self._nn_interpreter.get_tensor(self._nn_output_index)
+        
+        if self._nn_output_dtype == np.int8:
+            scale, zero_point = self._nn_output_quant
+            return float((output[0][0] - zero_point) * scale)
+        return float(output[0][0])
+    
+    def _extract_advanced_features(self, market_data: Dict, now: Optional[datetime] = None) -> Optional[np.ndarray]:
         """Extract advanced features from market data"""
         try:
             coingecko = market_data.get('coingecko', {})
@@ -439,7 +766,8 @@ class AdvancedFeePredictor:
                 return None
             
             # Current time features
-            now = datetime.now()
+            if now is None:
+                now = datetime.now()
             hour_of_day = now.hour
             day_of_week = now.weekday()
             
@@ -467,12 +795,23 @@ class AdvancedFeePredictor:
             # Gas trend
             gas_trend = (gas_price_gwei - 25) / 275
             
-            features = np.array([[
-                volatility, volume_24h, price_change_1h, price_change_24h,
-                market_cap, gas_price_gwei, liquidity_score,
-                hour_of_day, day_of_week, volume_ma_7d, volatility_ma_7d,
-                price_momentum, volume_ratio, gas_trend
-            ]])
+            # Fill the float32 row in place; it is owned by this request
+            features = np.empty((1, len(self.feature_columns)), dtype=np.float32)
+            row = features[0]
+            row[0] = volatility
+            row[1] = volume_24h
+            row[2] = price_change_1h
+            row[3] = price_change_24h
+            row[4] = market_cap
+            row[5] = gas_price_gwei
+            row[6] = liquidity_score
+            row[7] = hour_of_day
+            row[8] = day_of_week
+            row[9] = volume_ma_7d
+            row[10] = volatility_ma_7d
+            row[11] = price_momentum
+            row[12] = volume_ratio
+            row[13] = gas_trend
             
             return features
             
@@ -480,50 +819,72 @@ class AdvancedFeePredictor:
             logger.error(f"Error extracting advanced features: {e}")
             return None
     
+    def _predict_model(self, model_name: str, model, features: np.ndarray, features_scaled: Optional[np.ndarray]) -> float:
+        """Single-row prediction for one model (runs on the prediction thread pool)"""
+        if model_name == 'neural_network':
+            if self._nn_interpreter is not None:
+                with self._nn_lock:
+                    return self._predict_tflite(features_scaled)
+            if self._nn_fn is not None:
+                return float(self._nn_fn(features_scaled.astype(np.float32))[0, 0])
+            return model.predict(features_scaled, verbose=0)[0][0]
+        if model_name in self._legacy_scalers:
+            features = self._legacy_scalers[model_name].transform(features)
+        if model_name in self._ort_sessions:
+            return float(self._ort_sessions[model_name].run(None, {'X': features})[0].ravel()[0])
+        if model_name == 'xgboost' and self._xgb_booster is not None:
+            return self._xgb_booster.inplace_predict(features)[0]
+        if model_name == 'lightgbm' and self._lgb_booster is not None:
+            return self._lgb_booster.predict(features, num_threads=1, predict_disable_shape_check=True)[0]
+        return model.predict(features)[0]
+    
     async def predict_optimal_fee(self, market_data: Optional[Dict] = None) -> Dict:
         """Predict optimal fee using ensemble of models"""
+        # Single wall-clock read per prediction, shared by the time features and the response
+        now = datetime.now()
+        
         try:
             # Get market data if not provided
             if market_data is None:
                 market_data = await get_live_market_data()
             
             # Extract features
-            features = self._extract_advanced_features(market_data)
+            features = self._extract_advanced_features(market_data, now=now)
             if features is None:
-                return self._fallback_prediction()
+                return self._fallback_prediction(now)
             
             if not self.is_trained:
                 # Train models if not already trained
                 logger.info("Models not trained, training now...")
                 self.train_models()
             
-            # Get predictions from all models
+            # Only the neural network consumes scaled features
+            features_scaled = self.scaler.transform(features) if self.models.get('neural_network') is not None else None
+            
+            # Get predictions from all models concurrently
             predictions = {}
             confidences = {}
             
-            for model_name, model in self.models.items():
-                if model is None:
+            loop = asyncio.get_running_loop()
+            active_models = [(name, model) for name, model in self.models.items() if model is not None]
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(_predict_pool, self._predict_model, name, model, features, features_scaled)
+                    for name, model in active_models
+                ),
+                return_exceptions=True
+            )
+            
+            for (model_name, _), pred in zip(active_models, results):
+                if isinstance(pred, Exception):
+                    logger.warning(f"Error with {model_name}: {pred}")
                     continue
                 
-                try:
-                    # Scale features
-                    features_scaled = self.scalers[model_name].transform(features)
-                    
-                    # Make prediction
-                    if model_name == 'neural_network':
-                        pred = model.predict(features_scaled, verbose=0)[0][0]
-                    else:
-                        pred = model.predict(features_scaled)[0]
-                    
-                    predictions[model_name] = pred
-                    confidences[model_name] = self._calculate_model_confidence(model_name, features_scaled)
-                    
-                except Exception as e:
-                    logger.warning(f"Error with {model_name}: {e}")
-                    continue
+                predictions[model_name] = pred
+                confidences[model_name] = self._calculate_model_confidence(model_name, features)
             
             if not predictions:
-                return self._fallback_prediction()
+                return self._fallback_prediction(now)
             
             # Ensemble prediction (weighted average based on confidence)
             total_weight = sum(confidences.values())
@@ -557,34 +918,48 @@ class AdvancedFeePredictor:
                 "model_confidences": {k: round(v, 3) for k, v in confidences.items()},
                 "ensemble_method": "weighted_average",
                 "features_analyzed": len(self.feature_columns),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
             
         except Exception as e:
             logger.error(f"Error in advanced fee prediction: {e}")
-            return self._fallback_prediction()
+            return self._fallback_prediction(now)
+    
+    def predict_batch(self, features_matrix: np.ndarray) -> np.ndarray:
+        """Predict optimal fees for an (N, n_features) matrix in one predict call per model.
+
+        Returns the clamped mean of all model predictions for each row, so callers
+        can amortize per-call model overhead across many requests.
+        """
+        if not self.is_trained:
+            logger.info("Models not trained, training now...")
+            self.train_models()
+        
+        predictions = []
+        for model_name, model in self.models.items():
+            if model is None:
+                continue
+            if model_name == 'neural_network':
+                features_scaled = self.scaler.transform(features_matrix)
+                predictions.append(model.predict(features_scaled, verbose=0).ravel())
+            else:
+                if model_name in self._legacy_scalers:
+                    features = self._legacy_scalers[model_name].transform(features_matrix)
+                else:
+                    features = features_matrix
+                if model_name == 'xgboost':
+                    predictions.append(model.inplace_predict(features))
+                else:
+                    predictions.append(model.predict(features))
+        
+        return np.clip(np.mean(predictions, axis=0), 0.05, 3.0)
     
     def _calculate_model_confidence(self, model_name: str, features: np.ndarray) -> float:
         """Calculate confidence score for a model's prediction"""
         # Simple confidence calculation (can be improved with actual uncertainty estimation)
-        base_confidence = {
-            'random_forest': 0.85,
-            'gradient_boosting': 0.80,
-            'xgboost': 0.88,
-            'lightgbm': 0.86,
-            'neural_network': 0.82
-        }.get(model_name, 0.75)
-        
-        # Add feature-based confidence adjustment
-        volatility = features[0][0]  # First feature is volatility
-        if volatility > 15:  # High volatility reduces confidence
-            confidence_adjustment = -0.1
-        elif volatility < 2:  # Low volatility increases confidence
-            confidence_adjustment = 0.05
-        else:
-            confidence_adjustment = 0
-        
-        return max(0.5, min(base_confidence + confidence_adjustment, 0.95))
+        base_confidence = MODEL_BASE_CONFIDENCE.get(model_name, 0.75)
+        volatility = float(features[0][0])  # First feature is volatility
+        return _model_confidence(base_confidence, volatility)
     
     def _generate_advanced_reasoning(self, features: np.ndarray, predictions: Dict, final_prediction: float) -> str:
         """Generate detailed reasoning for the prediction"""
@@ -632,25 +1007,13 @@ class AdvancedFeePredictor:
     
     def _classify_market_condition(self, volatility: float, features: np.ndarray) -> str:
         """Classify current market condition"""
-        volume_24h = features[1]
-        price_change_24h = features[3]
-        gas_price_gwei = features[5]
-        
         # Multi-factor classification
-        if volatility > 15 and abs(price_change_24h) > 10:
-            return "highly_volatile"
-        elif volatility > 8 and gas_price_gwei > 80:
-            return "congested_volatile"
-        elif volatility < 2 and volume_24h > 800_000_000:
-            return "stable_liquid"
-        elif volatility < 3:
-            return "stable"
-        elif volatility > 10:
-            return "volatile"
-        else:
-            return "moderate"
+        code = _market_condition_code(
+            float(volatility), float(features[1]), float(features[3]), float(features[5])
+        )
+        return MARKET_CONDITIONS[code]
     
-    def _fallback_prediction(self) -> Dict:
+    def _fallback_prediction(self, now: Optional[datetime] = None) -> Dict:
         """Fallback prediction when models fail"""
         return {
             "recommended_fee": Config.BASE_FEE_RATE,
@@ -659,19 +1022,35 @@ class AdvancedFeePredictor:
             "market_condition": "unknown",
             "model_predictions": {},
             "ensemble_method": "fallback",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": (now or datetime.now()).isoformat()
         }
 
-# Initialize global advanced model
-advanced_fee_predictor = AdvancedFeePredictor()
+# Global advanced model, built on first use so importing this module stays cheap
+_predictor: Optional[AdvancedFeePredictor] = None
+_predictor_lock = threading.Lock()
+
+def _get_predictor() -> AdvancedFeePredictor:
+    """Return the shared AdvancedFeePredictor, constructing (and loading models) on first call"""
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = AdvancedFeePredictor()
+    return _predictor
+
+def __getattr__(name: str):
+    # Keeps `ml_models.advanced_fee_predictor` working now that it is created lazily
+    if name == 'advanced_fee_predictor':
+        return _get_predictor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 async def get_advanced_fee_recommendation(market_data: Optional[Dict] = None) -> Dict:
     """Get advanced ML-based fee recommendation"""
-    return await advanced_fee_predictor.predict_optimal_fee(market_data)
+    return await _get_predictor().predict_optimal_fee(market_data)
 
 async def train_advanced_models() -> Dict[str, float]:
     """Train all advanced models"""
-    return advanced_fee_predictor.train_models()
+    return _get_predictor().train_models()
 
 # Test function
 async def test_advanced_models():
@@ -0,0 +1,13 @@
+"""
+Sentiment classification thresholds for Aura AI Backend
+RSI buckets and the volatility cutoff used to label market sentiment
+"""
+import math
+
+# RSI sentiment buckets: < 30, [30, 40), [40, 60], (60, 70], > 70
+# Upper bins are nudged past 60/70 so those exact values stay in the lower bucket
+RSI_BINS = (30, 40, math.nextafter(60, math.inf), math.nextafter(70, math.inf))
+RSI_LABELS = ("bearish_extreme", "bearish", "neutral", "bullish", "bullish_extreme")
+
+# Volatility (%) above which sentiment is flagged as volatility-adjusted
+VOLATILITY_ADJUST_THRESHOLD = 8.0
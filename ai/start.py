@@ -7,6 +7,20 @@ import sys
 import logging
 import os
 
+import uvicorn
+
+# uvloop/httptools ship with uvicorn[standard]; fall back to asyncio/h11 without them (e.g. Windows)
+try:
+    import uvloop  # noqa: F401
+    LOOP = "uvloop"
+except ImportError:
+    LOOP = "asyncio"
+try:
+    import httptools  # noqa: F401
+    HTTP = "httptools"
+except ImportError:
+    HTTP = "h11"
+
 # Set environment variables for Railway
 os.environ.setdefault("PORT", "8000")
 os.environ.setdefault("HOST", "0.0.0.0")
@@ -14,44 +28,26 @@ os.environ.setdefault("HOST", "0.0.0.0")
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def start_minimal():
-    """Start minimal application"""
-    logger.info("Starting minimal FastAPI application...")
-    
-    from fastapi import FastAPI
-    from fastapi.middleware.cors import CORSMiddleware
-    from datetime import datetime
-    import uvicorn
-    
-    # Create minimal app
-    app = FastAPI(title="Aura AI Backend (Minimal)", version="1.0.0")
-    
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-    
-    @app.get("/")
-    async def root():
-        return {"status": "ok", "mode": "minimal", "timestamp": datetime.now().isoformat()}
-    
-    @app.get("/health")
-    async def health():
-        return {"status": "healthy", "mode": "minimal", "timestamp": datetime.now().isoformat()}
-    
-    @app.get("/ping")
-    async def ping():
-        return {"status": "ok", "timestamp": datetime.now().isoformat()}
-    
-    # Start server
+def run_server(app_path: str):
+    """Serve an ASGI app given as "module:attribute" with uvloop/httptools when installed"""
     port = int(os.environ.get("PORT", 8000))
     host = os.environ.get("HOST", "0.0.0.0")
+    # Pre-fork workers each import the app from app_path; defaults to a single process. Each
+    # worker has its own models and caches, and picks up retrained models on its next prediction.
+    workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
     
-    logger.info(f"Starting server on {host}:{port}")
-    uvicorn.run(app, host=host, port=port, log_level="info")
+    options = dict(host=host, port=port, log_level="info", access_log=False, loop=LOOP, http=HTTP)
+    logger.info(f"Starting server on {host}:{port} ({workers} worker(s), loop={LOOP}, http={HTTP})")
+    if workers > 1:
+        uvicorn.run(app_path, workers=workers, **options)
+    else:
+        # Single process: serve in-process, reusing the already-imported app module
+        uvicorn.Server(uvicorn.Config(app_path, **options)).run()
+
+def start_minimal():
+    """Start minimal application"""
+    logger.info("Starting minimal FastAPI application...")
+    run_server("minimal_app:app")
 
 def main():
     """Main startup function"""
@@ -59,14 +55,14 @@ def main():
     
     try:
         logger.info("Attempting to start full application...")
-        from main import app
-        import uvicorn
-        
-        port = int(os.environ.get("PORT", 8000))
-        host = os.environ.get("HOST", "0.0.0.0")
+        # Import here so a broken application falls back to minimal mode; uvicorn reuses the
+        # already-imported module in single-worker mode. The import also loads the production
+        # models, training and saving them first if none are on disk, so with WEB_CONCURRENCY > 1
+        # the workers all load that one saved set instead of each training into the same files.
+        import main  # noqa: F401
         
-        logger.info(f"Starting full application on {host}:{port}")
-        uvicorn.run(app, host=host, port=port, log_level="info")
+        logger.info("Starting full application")
+        run_server("main:app")
         
     except Exception as e:
         logger.error(f"Failed to start main application: {e}")
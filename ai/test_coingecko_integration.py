@@ -6,6 +6,7 @@ Demonstrates the new features and capabilities
 
 import asyncio
 import json
+import sys
 from datetime import datetime
 from data_pipeline import (
     get_live_market_data,
@@ -21,97 +22,121 @@ async def test_enhanced_coingecko_integration():
     print("🚀 Testing Enhanced CoinGecko Integration for Aura AI DEX")
     print("=" * 80)
     
+    # The six checks are independent CoinGecko round-trips: run them concurrently, then
+    # report each section in order (a raised exception is returned in place of its result)
+    coins = ["avalanche-2", "bitcoin", "ethereum", "solana"]
+    (
+        avax_data, multi_data, global_data, cross_analysis, market_sentiment, comprehensive_data
+    ) = await asyncio.gather(
+        get_enhanced_coingecko_data("avalanche-2"),
+        get_multi_coin_data(coins),
+        get_global_market_data(),
+        get_cross_asset_analysis(),
+        get_market_sentiment(),
+        get_live_market_data(),
+        return_exceptions=True
+    )
+    
+    # Every result is in hand: buffer the report and write it in one go
+    report_lines = []
+    report = report_lines.append
+    
     # Test 1: Enhanced single coin data
-    print("\n1. 📊 Testing Enhanced AVAX Data")
-    print("-" * 40)
+    report("\n1. 📊 Testing Enhanced AVAX Data")
+    report("-" * 40)
     try:
-        avax_data = await get_enhanced_coingecko_data("avalanche-2")
+        if isinstance(avax_data, Exception):
+            raise avax_data
         if avax_data:
-            print(f"✅ Price: ${avax_data.get('price_usd', 0):.4f}")
-            print(f"✅ 24h Change: {avax_data.get('price_change_24h', 0):.2f}%")
-            print(f"✅ Volatility: {avax_data.get('volatility', 0):.2f}%")
-            print(f"✅ RSI (14): {avax_data.get('rsi_14', 50):.1f}")
-            print(f"✅ Volume/Market Cap: {avax_data.get('volume_to_market_cap', 0):.2f}%")
-            print(f"✅ Volatility Class: {avax_data.get('volatility_class', 'unknown')}")
-            print(f"✅ Volume Class: {avax_data.get('volume_class', 'unknown')}")
-            print(f"✅ Price Position (24h): {avax_data.get('price_position_24h', 50):.1f}%")
+            report(f"✅ Price: ${avax_data.get('price_usd', 0):.4f}")
+            report(f"✅ 24h Change: {avax_data.get('price_change_24h', 0):.2f}%")
+            report(f"✅ Volatility: {avax_data.get('volatility', 0):.2f}%")
+            report(f"✅ RSI (14): {avax_data.get('rsi_14', 50):.1f}")
+            report(f"✅ Volume/Market Cap: {avax_data.get('volume_to_market_cap', 0):.2f}%")
+            report(f"✅ Volatility Class: {avax_data.get('volatility_class', 'unknown')}")
+            report(f"✅ Volume Class: {avax_data.get('volume_class', 'unknown')}")
+            report(f"✅ Price Position (24h): {avax_data.get('price_position_24h', 50):.1f}%")
         else:
-            print("❌ Failed to fetch enhanced AVAX data")
+            report("❌ Failed to fetch enhanced AVAX data")
     except Exception as e:
-        print(f"❌ Error: {e}")
+        report(f"❌ Error: {e}")
     
     # Test 2: Multi-coin analysis
-    print("\n2. 🌐 Testing Multi-Coin Analysis")
-    print("-" * 40)
+    report("\n2. 🌐 Testing Multi-Coin Analysis")
+    report("-" * 40)
     try:
-        coins = ["avalanche-2", "bitcoin", "ethereum", "solana"]
-        multi_data = await get_multi_coin_data(coins)
+        if isinstance(multi_data, Exception):
+            raise multi_data
         if multi_data:
-            print(f"✅ Fetched data for {len(multi_data)} coins:")
+            report(f"✅ Fetched data for {len(multi_data)} coins:")
             for coin_id, coin_data in multi_data.items():
                 symbol = coin_data.get('symbol', 'UNK')
                 price = coin_data.get('price_usd', 0)
                 change = coin_data.get('price_change_24h', 0)
-                print(f"   {symbol}: ${price:.4f} ({change:+.2f}%)")
+                report(f"   {symbol}: ${price:.4f} ({change:+.2f}%)")
         else:
-            print("❌ Failed to fetch multi-coin data")
+            report("❌ Failed to fetch multi-coin data")
     except Exception as e:
-        print(f"❌ Error: {e}")
+        report(f"❌ Error: {e}")
     
     # Test 3: Global market data
-    print("\n3. 🌍 Testing Global Market Data")
-    print("-" * 40)
+    report("\n3. 🌍 Testing Global Market Data")
+    report("-" * 40)
     try:
-        global_data = await get_global_market_data()
+        if isinstance(global_data, Exception):
+            raise global_data
         if global_data:
             total_cap = global_data.get('total_market_cap_usd', 0)
             total_vol = global_data.get('total_volume_24h_usd', 0)
             btc_dom = global_data.get('market_cap_percentage', {}).get('btc', 0)
             sentiment = global_data.get('market_sentiment', 'unknown')
             
-            print(f"✅ Total Market Cap: ${total_cap:,.0f}")
-            print(f"✅ 24h Volume: ${total_vol:,.0f}")
-            print(f"✅ BTC Dominance: {btc_dom:.1f}%")
-            print(f"✅ Market Sentiment: {sentiment}")
+            report(f"✅ Total Market Cap: ${total_cap:,.0f}")
+            report(f"✅ 24h Volume: ${total_vol:,.0f}")
+            report(f"✅ BTC Dominance: {btc_dom:.1f}%")
+            report(f"✅ Market Sentiment: {sentiment}")
         else:
-            print("❌ Failed to fetch global market data")
+            report("❌ Failed to fetch global market data")
     except Exception as e:
-        print(f"❌ Error: {e}")
+        report(f"❌ Error: {e}")
     
     # Test 4: Cross-asset analysis
-    print("\n4. 🔗 Testing Cross-Asset Analysis")
-    print("-" * 40)
+    report("\n4. 🔗 Testing Cross-Asset Analysis")
+    report("-" * 40)
     try:
-        cross_analysis = await get_cross_asset_analysis()
+        if isinstance(cross_analysis, Exception):
+            raise cross_analysis
         if cross_analysis:
             leadership = cross_analysis.get('market_leadership', 'unknown')
             correlations = cross_analysis.get('correlations', {})
             
-            print(f"✅ Market Leadership: {leadership}")
-            print(f"✅ Correlations found: {len(correlations)}")
+            report(f"✅ Market Leadership: {leadership}")
+            report(f"✅ Correlations found: {len(correlations)}")
             
             for pair, corr_data in list(correlations.items())[:3]:  # Show first 3
                 correlation = corr_data.get('correlation', 'neutral')
-                print(f"   {pair.replace('_', ' vs ')}: {correlation}")
+                report(f"   {pair.replace('_', ' vs ')}: {correlation}")
         else:
-            print("❌ Failed to fetch cross-asset analysis")
+            report("❌ Failed to fetch cross-asset analysis")
     except Exception as e:
-        print(f"❌ Error: {e}")
+        report(f"❌ Error: {e}")
     
     # Test 5: Market sentiment
-    print("\n5. 😊 Testing Market Sentiment")
-    print("-" * 40)
+    report("\n5. 😊 Testing Market Sentiment")
+    report("-" * 40)
     try:
-        sentiment = await get_market_sentiment()
-        print(f"✅ Overall Market Sentiment: {sentiment}")
+        if isinstance(market_sentiment, Exception):
+            raise market_sentiment
+        report(f"✅ Overall Market Sentiment: {market_sentiment}")
     except Exception as e:
-        print(f"❌ Error: {e}")
+        report(f"❌ Error: {e}")
     
     # Test 6: Comprehensive market data
-    print("\n6. 🎯 Testing Comprehensive Market Data")
-    print("-" * 40)
+    report("\n6. 🎯 Testing Comprehensive Market Data")
+    report("-" * 40)
     try:
-        comprehensive_data = await get_live_market_data()
+        if isinstance(comprehensive_data, Exception):
+            raise comprehensive_data
         if comprehensive_data:
             components = []
             if comprehensive_data.get('coingecko'):
@@ -129,25 +154,28 @@ async def test_enhanced_coingecko_integration():
             if comprehensive_data.get('cross_asset_analysis'):
                 components.append("Cross-Asset ✅")
             
-            print(f"✅ Data Sources: {', '.join(components)}")
+            report(f"✅ Data Sources: {', '.join(components)}")
             
             market_regime = comprehensive_data.get('market_regime', 'unknown')
-            print(f"✅ Market Regime: {market_regime}")
+            report(f"✅ Market Regime: {market_regime}")
             
             if comprehensive_data.get('market_indicators'):
                 indicators = comprehensive_data['market_indicators']
-                print(f"✅ Volatility Category: {indicators.get('volatility_category', 'unknown')}")
-                print(f"✅ Liquidity Tier: {indicators.get('liquidity_tier', 'unknown')}")
-                print(f"✅ Trend Direction: {indicators.get('trend_direction', 'unknown')}")
-                print(f"✅ Confidence Score: {indicators.get('confidence_score', 0):.2f}")
+                report(f"✅ Volatility Category: {indicators.get('volatility_category', 'unknown')}")
+                report(f"✅ Liquidity Tier: {indicators.get('liquidity_tier', 'unknown')}")
+                report(f"✅ Trend Direction: {indicators.get('trend_direction', 'unknown')}")
+                report(f"✅ Confidence Score: {indicators.get('confidence_score', 0):.2f}")
         else:
-            print("❌ Failed to fetch comprehensive market data")
+            report("❌ Failed to fetch comprehensive market data")
     except Exception as e:
-        print(f"❌ Error: {e}")
+        report(f"❌ Error: {e}")
     
-    print("\n" + "=" * 80)
-    print("🎉 Enhanced CoinGecko Integration Test Complete!")
-    print(f"⏰ Test completed at: {datetime.now().isoformat()}")
+    report("\n" + "=" * 80)
+    report("🎉 Enhanced CoinGecko Integration Test Complete!")
+    report(f"⏰ Test completed at: {datetime.now().isoformat()}")
+    
+    sys.stdout.write("\n".join(report_lines) + "\n")
+    sys.stdout.flush()
 
 # Test specific features
 async def test_technical_indicators():
@@ -158,19 +186,24 @@ async def test_technical_indicators():
     try:
         avax_data = await get_enhanced_coingecko_data("avalanche-2")
         if avax_data:
-            print("Technical Indicators for AVAX:")
-            print(f"  RSI (14): {avax_data.get('rsi_14', 50):.1f}")
-            print(f"  Price Volatility (7d): {avax_data.get('price_volatility_7d', 0):.2f}%")
-            print(f"  ATH Distance: {avax_data.get('ath_change_percentage', 0):.1f}%")
-            print(f"  24h High: ${avax_data.get('high_24h', 0):.4f}")
-            print(f"  24h Low: ${avax_data.get('low_24h', 0):.4f}")
-            print(f"  Market Cap Rank: #{avax_data.get('market_cap_rank', 0)}")
+            report_lines = []
+            report = report_lines.append
+            report("Technical Indicators for AVAX:")
+            report(f"  RSI (14): {avax_data.get('rsi_14', 50):.1f}")
+            report(f"  Price Volatility (7d): {avax_data.get('price_volatility_7d', 0):.2f}%")
+            report(f"  ATH Distance: {avax_data.get('ath_change_percentage', 0):.1f}%")
+            report(f"  24h High: ${avax_data.get('high_24h', 0):.4f}")
+            report(f"  24h Low: ${avax_data.get('low_24h', 0):.4f}")
+            report(f"  Market Cap Rank: #{avax_data.get('market_cap_rank', 0)}")
             
             # Derived metrics
-            print("\nDerived Metrics:")
-            print(f"  Volatility Class: {avax_data.get('volatility_class', 'unknown')}")
-            print(f"  Volume Class: {avax_data.get('volume_class', 'unknown')}")
-            print(f"  Price Position: {avax_data.get('price_position_24h', 50):.1f}%")
+            report("\nDerived Metrics:")
+            report(f"  Volatility Class: {avax_data.get('volatility_class', 'unknown')}")
+            report(f"  Volume Class: {avax_data.get('volume_class', 'unknown')}")
+            report(f"  Price Position: {avax_data.get('price_position_24h', 50):.1f}%")
+            
+            sys.stdout.write("\n".join(report_lines) + "\n")
+            sys.stdout.flush()
         
     except Exception as e:
         print(f"Error testing technical indicators: {e}")